@@ -12,4 +12,13 @@ def get_bug_paths():
 
 def get_indicia_paths():
     """Returns path for Indicia. Always returns a string for consistency."""
-    return get_asset_path("indicia.pdf")
\ No newline at end of file
+    return get_asset_path("indicia.pdf")
+
+def get_asset_paths():
+    """Returns a mapping of asset key to path for every overlay asset."""
+    bug_blk_path, bug_wht_path = get_bug_paths()
+    return {
+        "bug_black": bug_blk_path,
+        "bug_white": bug_wht_path,
+        "indicia": get_indicia_paths()
+    }
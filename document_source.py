@@ -0,0 +1,88 @@
+import mmap
+import os
+
+# Files at or above this size are memory-mapped instead of copied into memory.
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+_session_bytes_read = 0
+_session_bytes_mapped = 0
+
+
+def get_session_bytes_read():
+    """Returns the bytes actually read into memory by DocumentSources this session."""
+    return _session_bytes_read
+
+
+def get_session_bytes_mapped():
+    """Returns the total size of files memory-mapped this session (paged in on demand, not counted as read)."""
+    return _session_bytes_mapped
+
+
+class DocumentSource:
+    """
+    Reads a PDF from disk exactly once and serves every fitz handle from that buffer.
+    Small files are copied into memory; large files are memory-mapped read-only.
+
+    A mapped file is not a snapshot: on POSIX, if it is truncated or rewritten
+    while open, later page renders see the new bytes or fault with SIGBUS.
+    Callers must check is_modified() before touching a mapped source again.
+    """
+
+    def __init__(self, path, mmap_threshold=MMAP_THRESHOLD):
+        global _session_bytes_read, _session_bytes_mapped
+        self.path = path
+        self._file = None
+        self._mmap = None
+
+        f = open(path, "rb")
+        try:
+            st = os.fstat(f.fileno())
+            self.size = st.st_size
+            self.mtime_ns = st.st_mtime_ns
+            if self.size and self.size >= mmap_threshold:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._file = f
+                self.buffer = memoryview(self._mmap)
+            else:
+                self.buffer = f.read()
+        finally:
+            if self._file is None:
+                f.close()
+
+        # MuPDF loads objects lazily, so a mapping is only paged in where it is used;
+        # its size is reported separately rather than as bytes read.
+        self.mapped_size = self.size if self.is_mapped else 0
+        self.bytes_read = 0 if self.is_mapped else len(self.buffer)
+        _session_bytes_read += self.bytes_read
+        _session_bytes_mapped += self.mapped_size
+
+    @property
+    def is_mapped(self):
+        return self._mmap is not None
+
+    def open_document(self):
+        """Opens a new fitz document over the shared buffer (no disk I/O)."""
+        import fitz
+        return fitz.open(stream=self.buffer, filetype="pdf")
+
+    def is_modified(self):
+        """True if the file on disk has changed (or vanished) since it was loaded."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return True
+        return st.st_size != self.size or st.st_mtime_ns != self.mtime_ns
+
+    def close(self):
+        """Releases the buffer. Close every document opened from it first."""
+        if self._mmap is not None:
+            try:
+                self.buffer.release()
+                self._mmap.close()
+            except BufferError:
+                # A document still references the mapping; it is unmapped once collected.
+                pass
+            self._file.close()
+            self._mmap = None
+            self._file = None
+        self.buffer = None
@@ -1,7 +1,12 @@
+import os
 import customtkinter as ctk
 from tkinterdnd2 import TkinterDnD
 from ui import UnionBugInserter
 
+def fast_start_enabled():
+    """Startup-performance mode is on unless UNIONBUG_FAST_START=0."""
+    return os.environ.get("UNIONBUG_FAST_START", "1") != "0"
+
 # Create a class that combines CustomTkinter + Drag & Drop
 class Tk(ctk.CTk, TkinterDnD.DnDWrapper):
     def __init__(self, *args, **kwargs):
@@ -16,7 +21,7 @@ if __name__ == "__main__":
     root = Tk()  
     root.geometry("1200x850")
     
-    app = UnionBugInserter(root)
+    app = UnionBugInserter(root, fast_start=fast_start_enabled())
     
     try:
         import pyi_splash
@@ -1,43 +1,41 @@
-from PIL import Image, ImageTk
 from tkinter import filedialog, messagebox
 import os
 
-def load_pdf(file_path):
-    """Safely loads a PDF."""
-    import fitz
+def load_pdf(source):
+    """Safely opens a PDF from a DocumentSource buffer."""
     try:
-        return fitz.open(file_path)
+        return source.open_document()
     except Exception as e:
         messagebox.showerror("Error", f"Could not load PDF: {e}")
         return None
 
-def get_page_image(page, canvas_width, canvas_height):
-    """Renders a PDF page to a PIL image that fits within the canvas dimensions."""
-    import fitz
+def get_page_scale(page, canvas_width, canvas_height):
+    """Returns the scale at which a page fits within the canvas dimensions (None for empty pages)."""
     margin = 50
     if page.rect.width == 0 or page.rect.height == 0:
-        return None, None, 1.0
+        return None
 
-    scale = min((canvas_width - margin) / page.rect.width, (canvas_height - margin) / page.rect.height, 2.0)
+    return min((canvas_width - margin) / page.rect.width, (canvas_height - margin) / page.rect.height, 2.0)
 
+def rasterize_page(page, scale):
+    """Renders a PDF page to a PIL image at the given scale."""
+    import fitz
+    from PIL import Image
     mat = fitz.Matrix(scale, scale)
     pix = page.get_pixmap(matrix=mat, alpha=False)
-    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-    return img, ImageTk.PhotoImage(img), scale
+    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
 
-def render_preview_image(overlay_page, target_width_inch, display_scale):
-    """Renders the overlay (Bug/Indicia) for the UI preview."""
+def rasterize_overlay(overlay_page, target_width_inch, display_scale):
+    """Renders the overlay (Bug/Indicia) to a transparent PIL image."""
     import fitz
+    from PIL import Image
     target_width_px = int(target_width_inch * 72 * display_scale)
     aspect = overlay_page.rect.height / overlay_page.rect.width
     target_height_px = int(target_width_px * aspect)
 
     mat = fitz.Matrix(target_width_px / overlay_page.rect.width, target_height_px / overlay_page.rect.height)
     pix = overlay_page.get_pixmap(matrix=mat, alpha=True)
-    img = Image.frombytes("RGBA", [pix.width, pix.height], pix.samples)
-
-    return ImageTk.PhotoImage(img)
+    return Image.frombytes("RGBA", [pix.width, pix.height], pix.samples)
 
 def get_brightness_at_loc(pil_img, x, y):
     """Checks pixel brightness to decide black vs white bug."""
@@ -69,6 +67,17 @@ def save_pdf_with_overlays(app):
         messagebox.showinfo("Info", "No active overlays to save.")
         return
 
+    # Saving always uses the bytes read at load time; warn if the file has changed since.
+    source = app.pdf_source
+    if source.is_modified():
+        if source.is_mapped:
+            messagebox.showerror("Error", "The PDF changed on disk since it was opened. Please reopen it before saving.")
+            return
+        if not messagebox.askyesno("File Changed",
+                                   "The PDF changed on disk since it was opened.\n"
+                                   "Save using the version that was loaded?"):
+            return
+
     # 2. Get Save Path
     original_name = os.path.splitext(os.path.basename(app.pdf_path))[0]
     save_path = filedialog.asksaveasfilename(
@@ -79,11 +88,20 @@ def save_pdf_with_overlays(app):
     )
     if not save_path: return
 
+    # Overwriting the open PDF would look like an outside change (or fail while it is mapped)
+    try:
+        overwrites_source = os.path.samefile(save_path, source.path)
+    except OSError:
+        overwrites_source = False  # target or original does not exist
+    if overwrites_source:
+        messagebox.showerror("Error", "Cannot overwrite the PDF that is currently open. Please choose a different file name.")
+        return
+
     try:
         import fitz
         # 3. OPEN SOURCE & CREATE NEW DOC
-        # We open a fresh handle to the source
-        src_doc = fitz.open(app.pdf_path)
+        # We open a fresh handle over the buffer read at load time (no second disk read)
+        src_doc = source.open_document()
         
         # We create a brand new, empty PDF
         out_doc = fitz.open()
@@ -99,7 +117,10 @@ def save_pdf_with_overlays(app):
             except IndexError:
                 continue
 
-            asset_doc = app.assets[item["asset_key"]] 
+            # Load via the app: previews may have come from the raster cache, leaving assets unopened
+            asset_doc = app._get_asset(item["asset_key"])
+            if not asset_doc:
+                raise RuntimeError(f"Could not load asset '{item['asset_key']}'")
             overlay_page = asset_doc[0]
 
             x_pt, y_pt = item["coords"]
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+
+CACHE_VERSION = 1
+MAX_OVERLAY_ENTRIES = 256
+# Pages that rasterize faster than this are cheaper to re-render than to decode from PNG.
+PAGE_CACHE_MIN_RENDER_MS = 50
+
+
+def get_cache_dir():
+    """Returns the per-user cache directory. UNIONBUG_CACHE_DIR overrides it."""
+    override = os.environ.get("UNIONBUG_CACHE_DIR")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return os.path.join(base, "UnionBugInserter")
+
+
+class RasterCache:
+    """
+    On-disk cache of pre-rasterized previews, stored as PNG files.
+    Overlays are keyed by asset content hash + scale; only one first-page raster
+    (the most recently stored document and scale) is kept.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or get_cache_dir()
+        self._digests = {}
+        self._index = None
+        self._write_lock = threading.Lock()
+
+    # --- KEYS ---
+
+    def asset_digest(self, path):
+        """Content hash of an asset file, memoized per (path, size, mtime)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        memo_key = (path, st.st_size, st.st_mtime_ns)
+        if memo_key not in self._digests:
+            with open(path, "rb") as f:
+                self._digests[memo_key] = hashlib.sha1(f.read()).hexdigest()
+        return self._digests[memo_key]
+
+    def document_key(self, source):
+        """Cheap key for a DocumentSource: path plus the size and mtime it had when loaded."""
+        raw = f"{os.path.abspath(source.path)}|{source.size}|{source.mtime_ns}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, kind, digest, scale):
+        return os.path.join(self.cache_dir, f"{kind}-v{CACHE_VERSION}-{digest[:20]}-{scale:.4f}.png")
+
+    # --- RASTERS ---
+
+    def load(self, kind, digest, scale):
+        """Returns the cached PIL image, or None on a miss."""
+        if not digest:
+            return None
+        path = self._entry_path(kind, digest, scale)
+        if not os.path.exists(path):
+            return None
+        from PIL import Image
+        try:
+            with Image.open(path) as img:
+                img.load()
+                return img
+        except Exception:
+            return None
+
+    def store(self, kind, digest, scale, img, keep_latest_only=False):
+        """
+        Writes a PIL image atomically. keep_latest_only drops every other entry of the same kind.
+        Safe to call from a worker thread.
+        """
+        if not digest or img is None:
+            return
+        with self._write_lock:
+            self._store(kind, digest, scale, img, keep_latest_only)
+
+    def _store(self, kind, digest, scale, img, keep_latest_only):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._entry_path(kind, digest, scale)
+            if keep_latest_only:
+                self._prune(kind, keep=0, exclude_path=path)
+            else:
+                self._prune(kind, keep=MAX_OVERLAY_ENTRIES - 1)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            # Fast compression: these files are local, short-lived, and decoded on the hot path
+            img.save(tmp_path, format="PNG", compress_level=1)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Raster cache write failed: {e}")
+
+    def _prune(self, kind, keep, exclude_path=None):
+        prefix = f"{kind}-"
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.startswith(prefix) or not name.endswith(".png"):
+                continue
+            full = os.path.join(self.cache_dir, name)
+            if full == exclude_path:
+                continue
+            try:
+                entries.append((os.path.getmtime(full), full))
+            except OSError:
+                continue
+        entries.sort(reverse=True)
+        for _, full in entries[keep:]:
+            try:
+                os.remove(full)
+            except OSError:
+                pass
+
+    # --- ASSET METADATA ---
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, f"index-v{CACHE_VERSION}.json")
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path(), "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def load_size(self, digest):
+        """Returns the cached (width_pt, height_pt) of an asset's first page, or None."""
+        if not digest:
+            return None
+        size = self._load_index().get(digest)
+        return tuple(size) if size else None
+
+    def store_size(self, digest, width_pt, height_pt):
+        if not digest:
+            return
+        index = self._load_index()
+        index[digest] = [width_pt, height_pt]
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._index_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self._index_path())
+        except OSError as e:
+            print(f"Raster cache write failed: {e}")
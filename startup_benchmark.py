@@ -0,0 +1,119 @@
+"""
+Startup benchmark: measures cold-start and time-to-first-interaction.
+
+Each run launches a fresh interpreter, so import costs are paid every time.
+  cold start       = process start -> main window mapped on screen
+  first interaction = process start -> PDF opened and a Union Bug preview placed
+  save              = saving the document with that overlay (run in every mode,
+                      so the warm-cache path where assets were never opened is covered)
+  page raster       = time to produce the first-page raster, and whether it was
+                      rendered or loaded from the cache (shows whether the page cache helps)
+
+Usage: python startup_benchmark.py [document.pdf] [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CHILD = r'''
+import time
+t0 = time.perf_counter()
+import json, os, sys
+from types import SimpleNamespace
+sys.path.insert(0, sys.argv[1])
+import main as app_main
+import pdf_handler
+t_import = time.perf_counter()
+
+root = app_main.Tk()
+root.geometry("1200x850")
+marks = {}
+root.bind("<Map>", lambda e: marks.setdefault("window", time.perf_counter()), add="+")
+app = app_main.UnionBugInserter(root, fast_start=app_main.fast_start_enabled())
+while "window" not in marks:
+    root.update()
+root.update()
+
+app.open_pdf(sys.argv[2])
+root.update()
+page_raster = app.page_raster_stats
+app.on_canvas_click(SimpleNamespace(x=app.canvas.winfo_width() // 2, y=app.canvas.winfo_height() // 2))
+root.update()
+t_interact = time.perf_counter()
+
+# Save without dialogs; any error message fails the run.
+save_path = sys.argv[3]
+errors = []
+pdf_handler.filedialog.asksaveasfilename = lambda **kw: save_path
+pdf_handler.messagebox.showinfo = lambda *a, **kw: None
+pdf_handler.messagebox.showerror = lambda title, msg, **kw: errors.append(msg)
+app.save_pdf()
+t_save = time.perf_counter()
+root.destroy()
+if errors or not os.path.exists(save_path):
+    sys.exit(f"Save failed: {errors}")
+
+print(json.dumps({
+    "import": t_import - t0,
+    "cold_start": marks["window"] - t0,
+    "first_interaction": t_interact - t0,
+    "save": t_save - t_interact,
+    "page_raster": page_raster["ms"] / 1000,
+    "page_raster_source": page_raster["source"],
+}))
+'''
+
+
+def run_once(pdf_path, fast_start, cache_dir):
+    env = dict(os.environ)
+    env["UNIONBUG_FAST_START"] = "1" if fast_start else "0"
+    env["UNIONBUG_CACHE_DIR"] = cache_dir
+    with tempfile.TemporaryDirectory() as out_dir:
+        save_path = os.path.join(out_dir, "benchmark_processed.pdf")
+        out = subprocess.run([sys.executable, "-c", CHILD, HERE, pdf_path, save_path],
+                             env=env, capture_output=True, text=True)
+    if out.returncode != 0:
+        raise SystemExit(f"Benchmark run failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(label, results):
+    print(f"{label:<22}", end="")
+    for metric in ("import", "cold_start", "first_interaction", "save", "page_raster"):
+        values = [r[metric] * 1000 for r in results]
+        print(f"  {metric}: {statistics.median(values):7.1f} ms", end="")
+    sources = sorted({r["page_raster_source"] for r in results})
+    print(f"  (page from {'/'.join(sources)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", nargs="?", default=os.path.join(HERE, "assets", "Indicia.pdf"))
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = [run_once(args.pdf, False, os.path.join(tmp, "unused")) for _ in range(args.runs)]
+
+        cold = []
+        for i in range(args.runs):
+            cold.append(run_once(args.pdf, True, os.path.join(tmp, f"cold-{i}")))
+
+        warm_dir = os.path.join(tmp, "warm")
+        run_once(args.pdf, True, warm_dir)
+        warm = [run_once(args.pdf, True, warm_dir) for _ in range(args.runs)]
+
+    print(f"Median of {args.runs} runs, document: {os.path.basename(args.pdf)}")
+    summarize("standard", baseline)
+    summarize("fast start, cold cache", cold)
+    summarize("fast start, warm cache", warm)
+
+
+if __name__ == "__main__":
+    main()
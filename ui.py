@@ -1,23 +1,27 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import customtkinter as ctk
-from PIL import Image, ImageTk
 import os
+import threading
+import time
 from tkinterdnd2 import DND_FILES
 
-# Import our optimized handler
+# Import our optimized handler (PIL and fitz are imported on first use)
 from pdf_handler import (
-    load_pdf, get_page_image, render_preview_image,
+    load_pdf, get_page_scale, rasterize_page, rasterize_overlay,
     save_pdf_with_overlays, get_brightness_at_loc
 )
-from assets import get_bug_paths, get_indicia_paths
+from assets import get_asset_paths
+from document_source import DocumentSource, get_session_bytes_read, get_session_bytes_mapped
+from raster_cache import RasterCache, PAGE_CACHE_MIN_RENDER_MS
 
 ctk.set_appearance_mode("System")
 ctk.set_default_color_theme("blue")
 
 class UnionBugInserter:
-    def __init__(self, root):
+    def __init__(self, root, fast_start=False):
         self.root = root
+        self.fast_start = fast_start
         self.root.title("Union Bug & Indicia Placer")
         self.root.geometry("1200x850")
 
@@ -31,6 +35,12 @@ class UnionBugInserter:
 
         # --- ASSET LOADING (lazy — deferred until first use) ---
         self.assets = {}
+        self.asset_paths = get_asset_paths()
+
+        # --- RASTER CACHE (startup-performance mode only) ---
+        self.raster_cache = RasterCache() if fast_start else None
+        self._pending_cache_writes = {}
+        self.page_raster_stats = None
 
         # --- APP STATE ---
         self.overlays = {
@@ -55,6 +65,7 @@ class UnionBugInserter:
         self.show_grid = tk.BooleanVar(value=False)
         self.current_target_key = "bug"
         self.pdf_doc = None
+        self.pdf_source = None
         self.pdf_path = None
         self.current_page_index = 0
         self.zoom_level = 1.0
@@ -81,18 +92,64 @@ class UnionBugInserter:
         if not self.assets:
             import fitz
             try:
-                bug_blk_path, bug_wht_path = get_bug_paths()
-                indicia_path = get_indicia_paths()
-                self.assets = {
-                    "bug_black": fitz.open(bug_blk_path),
-                    "bug_white": fitz.open(bug_wht_path),
-                    "indicia":   fitz.open(indicia_path)
-                }
+                self.assets = {k: fitz.open(p) for k, p in self.asset_paths.items()}
             except Exception as e:
                 print(f"Error loading assets: {e}")
                 self.assets = {}
         return self.assets.get(key)
 
+    def _get_asset_size(self, key):
+        """Returns (width_pt, height_pt) of an asset, from the raster cache index when possible."""
+        digest = self.raster_cache.asset_digest(self.asset_paths[key]) if self.raster_cache else None
+        size = self.raster_cache.load_size(digest) if digest else None
+        if size:
+            return size
+
+        asset_doc = self._get_asset(key)
+        if not asset_doc: return None
+        rect = asset_doc[0].rect
+        if digest:
+            self.raster_cache.store_size(digest, rect.width, rect.height)
+        return rect.width, rect.height
+
+    def _get_preview_image(self, key, size_inch):
+        """Returns the overlay preview, served from the raster cache when possible."""
+        from PIL import ImageTk
+        scale = round(size_inch * self.display_scale, 4)
+        digest = None
+        if self.raster_cache:
+            digest = self.raster_cache.asset_digest(self.asset_paths[key])
+            img = self.raster_cache.load("overlay", digest, scale)
+            if img is not None:
+                return ImageTk.PhotoImage(img)
+
+        asset_doc = self._get_asset(key)
+        img = rasterize_overlay(asset_doc[0], size_inch, self.display_scale)
+        if digest:
+            self._queue_cache_write(key, "overlay", digest, scale, img)
+        return ImageTk.PhotoImage(img)
+
+    def _queue_cache_write(self, slot, kind, digest, scale, img, keep_latest_only=False):
+        """Debounces cache writes so slider drags and zooms only persist the scale they settle on."""
+        self._pending_cache_writes[slot] = (kind, digest, scale, img, keep_latest_only)
+        if hasattr(self, "_cache_job"): self.root.after_cancel(self._cache_job)
+        self._cache_job = self.root.after(1000, self._flush_cache_writes)
+
+    def _flush_cache_writes(self):
+        pending, self._pending_cache_writes = self._pending_cache_writes, {}
+        # PNG encoding takes tens of ms for a full page, so write from a worker with private copies
+        jobs = [(kind, digest, scale, img.copy(), keep_latest_only)
+                for kind, digest, scale, img, keep_latest_only in pending.values()]
+        threading.Thread(target=self._write_cache_entries, args=(jobs,)).start()
+
+    def _write_cache_entries(self, jobs):
+        for kind, digest, scale, img, keep_latest_only in jobs:
+            self.raster_cache.store(kind, digest, scale, img, keep_latest_only=keep_latest_only)
+
+    def on_root_destroy(self, event):
+        if event.widget is self.root and self._pending_cache_writes:
+            self._flush_cache_writes()
+
     def setup_ui(self):
         # 1. Canvas Area
         self.canvas_frame = ctk.CTkFrame(self.root, corner_radius=0)
@@ -115,8 +172,15 @@ class UnionBugInserter:
         self.canvas.bind("<Button-4>", self.on_mouse_wheel)
         self.canvas.bind("<Button-5>", self.on_mouse_wheel)
         self.root.bind("<Configure>", self.on_window_resize)
+        self.root.bind("<Destroy>", self.on_root_destroy, add="+")
 
-        # 2. Sidebar
+        # 2. Sidebar (deferred until the window is on screen in startup-performance mode)
+        if self.fast_start:
+            self.root.after_idle(self.setup_sidebar)
+        else:
+            self.setup_sidebar()
+
+    def setup_sidebar(self):
         self.sidebar = ctk.CTkFrame(self.root, width=250, corner_radius=0)
         self.sidebar.grid(row=0, column=1, sticky="nsew")
 
@@ -214,24 +278,17 @@ class UnionBugInserter:
 
         if f:
             # Close the currently loaded PDF and reset state before opening a new one
-            if self.pdf_doc:
-                self.pdf_doc.close()
-                self.pdf_doc = None
-                self.pdf_path = None
-                self.current_page_index = 0
-                self.zoom_level = 1.0
-                self.canvas.delete("all")
-                for key, data in self.overlays.items():
-                    data["active"].set(False)
-                    data["coords"] = None
-                    data["page_index"] = None
-                    data["preview_id"] = None
-                self.lbl_info.configure(text="")
-                self.lbl_page.configure(text="Page 1")
+            if self.pdf_doc or self.pdf_source:
+                self.close_pdf()
 
             self.pdf_path = f
             try:
-                self.pdf_doc = load_pdf(f)
+                self.pdf_source = DocumentSource(f)
+                self.pdf_doc = load_pdf(self.pdf_source)
+                if not self.pdf_doc:
+                    # load_pdf has already reported the error
+                    self.close_pdf()
+                    return
                 self.current_page_index = 0
 
                 # Info Display
@@ -239,11 +296,37 @@ class UnionBugInserter:
                 w_in = page.rect.width / 72
                 h_in = page.rect.height / 72
 
-                self.lbl_info.configure(text=f"{os.path.basename(f)}\n{w_in:.2f} x {h_in:.2f} in")
+                read_mb = get_session_bytes_read() / (1024 * 1024)
+                info = f"{os.path.basename(f)}\n{w_in:.2f} x {h_in:.2f} in\nRead this session: {read_mb:.1f} MB"
+                mapped_mb = get_session_bytes_mapped() / (1024 * 1024)
+                if mapped_mb:
+                    info += f"\nMapped (read on demand): {mapped_mb:.1f} MB"
+                self.lbl_info.configure(text=info)
                 self.render_page()
             except Exception as e:
+                self.close_pdf()
                 messagebox.showerror("Error", f"Failed to load PDF: {e}")
 
+    def close_pdf(self):
+        """Closes the current document and its source buffer, and resets the view."""
+        if self.pdf_doc:
+            self.pdf_doc.close()
+            self.pdf_doc = None
+        if self.pdf_source:
+            self.pdf_source.close()
+            self.pdf_source = None
+        self.pdf_path = None
+        self.current_page_index = 0
+        self.zoom_level = 1.0
+        self.canvas.delete("all")
+        for key, data in self.overlays.items():
+            data["active"].set(False)
+            data["coords"] = None
+            data["page_index"] = None
+            data["preview_id"] = None
+        self.lbl_info.configure(text="")
+        self.lbl_page.configure(text="Page 1")
+
     def clear_all(self):
         for key, data in self.overlays.items():
             data["active"].set(False)
@@ -264,9 +347,7 @@ class UnionBugInserter:
         self.on_target_switch("Union Bug")
 
         data = self.overlays["bug"]
-        asset_doc = self._get_asset(data["asset_key"])
-        if not asset_doc: return
-        page = asset_doc[0]
+        if not self._get_asset_size(data["asset_key"]): return
 
         width_pt = data["size"].get() * 72
         page_width_pt = self.current_pdf_page_width_pt
@@ -310,12 +391,12 @@ class UnionBugInserter:
         asset_key = target["asset_key"]
         if self.current_target_key == "bug": asset_key = "bug_black"
 
-        asset_doc = self._get_asset(asset_key)
+        asset_size = self._get_asset_size(asset_key)
 
-        if asset_doc:
-            page = asset_doc[0]
+        if asset_size:
+            asset_w, asset_h = asset_size
             width_pt = target["size"].get() * 72
-            aspect_ratio = page.rect.height / page.rect.width
+            aspect_ratio = asset_h / asset_w
             height_pt = width_pt * aspect_ratio
 
             final_x = click_x_pt - (width_pt / 2)
@@ -368,8 +449,7 @@ class UnionBugInserter:
                     b = get_brightness_at_loc(self.page_image, check_x, check_y)
                     data["asset_key"] = "bug_white" if b < 128 else "bug_black"
 
-                asset_doc = self._get_asset(data["asset_key"])
-                tk_img = render_preview_image(asset_doc[0], data["size"].get(), self.display_scale)
+                tk_img = self._get_preview_image(data["asset_key"], data["size"].get())
                 data["tk_ref"] = tk_img
 
                 dx = x_pt * self.display_scale + self.offset_x
@@ -401,14 +481,22 @@ class UnionBugInserter:
 
         if not self.pdf_doc: return
 
+        # Reading a mapped file that changed underneath us can fault, so stop before rendering
+        if self.pdf_source.is_mapped and self.pdf_source.is_modified():
+            self.on_source_changed()
+            return
+
         page = self.pdf_doc[self.current_page_index]
         self.current_pdf_page_width_pt = page.rect.width
         self.current_pdf_page_height_pt = page.rect.height
 
         self.canvas.update_idletasks()
 
-        pil_img, tk_img, scale = get_page_image(page, self.canvas.winfo_width(), self.canvas.winfo_height())
+        scale = get_page_scale(page, self.canvas.winfo_width(), self.canvas.winfo_height())
+        if scale is None: return
+        pil_img = self._get_page_raster(page, scale)
 
+        from PIL import Image, ImageTk
         w, h = pil_img.size
         new_w, new_h = int(w * self.zoom_level), int(h * self.zoom_level)
         self.page_image = pil_img.resize((new_w, new_h), Image.LANCZOS)
@@ -430,6 +518,38 @@ class UnionBugInserter:
         self.draw_grid()
         self.refresh_previews()
 
+    def _get_page_raster(self, page, scale):
+        """
+        Rasterizes the current page; the first page is served from the raster cache when possible.
+        Only pages slower to render than PAGE_CACHE_MIN_RENDER_MS are cached.
+        """
+        doc_key = None
+        start = time.perf_counter()
+        # A modified source no longer matches the file on disk, so its raster must not be cached
+        if self.raster_cache and self.current_page_index == 0 and not self.pdf_source.is_modified():
+            doc_key = self.raster_cache.document_key(self.pdf_source)
+            img = self.raster_cache.load("page", doc_key, scale)
+            if img is not None:
+                self.page_raster_stats = {"source": "cache", "ms": (time.perf_counter() - start) * 1000}
+                return img
+
+        start = time.perf_counter()
+        img = rasterize_page(page, scale)
+        render_ms = (time.perf_counter() - start) * 1000
+        self.page_raster_stats = {"source": "render", "ms": render_ms}
+        if doc_key and render_ms >= PAGE_CACHE_MIN_RENDER_MS:
+            self._queue_cache_write("page", "page", doc_key, scale, img, keep_latest_only=True)
+        return img
+
+    def on_source_changed(self):
+        """Closes a memory-mapped PDF that changed on disk and offers to reopen it."""
+        path = self.pdf_path
+        self.close_pdf()
+        if messagebox.askyesno("File Changed",
+                               f"{os.path.basename(path)} changed on disk while it was open.\n"
+                               "Reopen it now? Placed elements will be cleared."):
+            self.open_pdf(path)
+
     def prev_page(self):
         if self.current_page_index > 0:
             self.current_page_index -= 1